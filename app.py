@@ -14,7 +14,18 @@ from reportlab.lib.utils import simpleSplit
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 import tempfile
+import hashlib
+import json
+import os
+import sys
+import argparse
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
 from pathlib import Path
+import pypdfium2 as pdfium
+from pdfminer.pdftypes import PDFObjRef, PDFStream
+from pdfminer.psparser import PSLiteral, PSKeyword
 
 # Page configuration
 st.set_page_config(
@@ -28,6 +39,59 @@ if 'orders' not in st.session_state:
     st.session_state.orders = []
 if 'parsed_data' not in st.session_state:
     st.session_state.parsed_data = None
+if 'duplicates' not in st.session_state:
+    st.session_state.duplicates = []
+
+# Where the order -> source page index and copies of parsed PDFs are kept
+ORDER_INDEX_DIR = Path(__file__).parent / 'order_index'
+
+
+class PageCache:
+    """Remembers extracted page text and parsed orders by page fingerprint (LRU)"""
+    
+    def __init__(self, max_pages=5000):
+        self.max_pages = max_pages
+        # page fingerprint -> extracted text
+        self.text = OrderedDict()
+        # (order_id, page fingerprints...) -> parsed items; every order has at
+        # least one page, so max_pages bounds this too
+        self.orders = OrderedDict()
+        # Streamlit sessions share the cache from separate threads
+        self.lock = threading.Lock()
+    
+    def _get(self, entries, key):
+        """Look up an entry and mark it most recently used"""
+        with self.lock:
+            if key not in entries:
+                return None
+            entries.move_to_end(key)
+            return entries[key]
+    
+    def _put(self, entries, key, value):
+        """Store an entry, evicting the least recently used past max_pages"""
+        with self.lock:
+            entries[key] = value
+            entries.move_to_end(key)
+            while len(entries) > self.max_pages:
+                entries.popitem(last=False)
+    
+    def get_text(self, fingerprint):
+        return self._get(self.text, fingerprint)
+    
+    def put_text(self, fingerprint, text):
+        self._put(self.text, fingerprint, text)
+    
+    def get_items(self, cache_key):
+        return self._get(self.orders, cache_key)
+    
+    def put_items(self, cache_key, items):
+        self._put(self.orders, cache_key, items)
+
+
+@st.cache_resource
+def get_page_cache():
+    """Page cache shared by every browser session until the app restarts"""
+    return PageCache()
 
 
 class OrderParser:
@@ -42,6 +106,9 @@ class OrderParser:
         'BS-1Pcs': 'Bath Sheet'
     }
     
+    # SKU lines that start an item's customization block
+    SKU_PATTERN = r'(Set-\d+Pcs|HT-\d+Pcs|BT-\d+Pcs|BS-\d+Pcs)-([A-Za-z]+)'
+    
     # Production equivalents for 3-piece sets
     PRODUCTION_MULTIPLIERS = {
         'Set-6Pcs': 2.0,
@@ -82,20 +149,89 @@ class OrderParser:
         'Turquoise': 'Turquesa'
     }
     
-    def __init__(self):
+    def __init__(self, page_cache=None):
         self.orders = []
+        # Shared across parses so re-downloaded exports only pay for new pages
+        self.page_cache = page_cache if page_cache is not None else PageCache()
+        # "file_hash:order_id" -> where the order came from (see OrderIndex)
+        self.order_locations = {}
+        # file hash -> original PDF bytes, for pulling slip pages later
+        self.source_pdfs = {}
         
     def parse_pdf(self, pdf_file, filename):
         """Parse a single PDF file"""
         try:
-            with pdfplumber.open(pdf_file) as pdf:
-                pages_text = [page.extract_text() for page in pdf.pages]
-                return self._process_pages(pages_text, filename)
+            pdf_file.seek(0)
+            return self.parse_pdf_bytes(pdf_file.read(), filename)
         except Exception as e:
             st.error(f"Error parsing {filename}: {str(e)}")
             return []
     
-    def _process_pages(self, pages_text, filename):
+    def parse_pdf_bytes(self, pdf_bytes, filename):
+        """Parse the bytes of a single PDF file, raising if it cannot be read"""
+        file_hash = hashlib.sha1(pdf_bytes).hexdigest()
+        with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
+            pages_text = []
+            page_hashes = []
+            # PDF object id -> digest, so shared fonts/XObjects are hashed once per file
+            object_digests = {}
+            for page in pdf.pages:
+                fingerprint = self._page_fingerprint(page, object_digests)
+                text = self.page_cache.get_text(fingerprint)
+                if text is None:
+                    text = page.extract_text() or ''
+                    self.page_cache.put_text(fingerprint, text)
+                pages_text.append(text)
+                page_hashes.append(fingerprint)
+        
+        self.source_pdfs[file_hash] = pdf_bytes
+        return self._process_pages(pages_text, filename, page_hashes, file_hash)
+    
+    def _page_fingerprint(self, page, object_digests):
+        """Hash a page's content streams and resources without running text extraction"""
+        # Resources matter as much as the content stream: many producers draw
+        # every page as `/Fm0 Do` with the real content in a per-page XObject,
+        # and subset fonts can map the same codes to different text per file
+        digest = hashlib.sha1()
+        self._hash_pdf_object(digest, page.page_obj.contents, object_digests)
+        self._hash_pdf_object(digest, page.page_obj.resources, object_digests)
+        return digest.hexdigest()
+    
+    def _hash_pdf_object(self, digest, obj, object_digests):
+        """Feed a PDF object into the digest, following references and stream data"""
+        if isinstance(obj, PDFObjRef):
+            # Object numbers differ between exports, so hash the referenced
+            # content rather than the reference itself
+            if obj.objid not in object_digests:
+                object_digests[obj.objid] = None  # Guards against reference cycles
+                sub_digest = hashlib.sha1()
+                self._hash_pdf_object(sub_digest, obj.resolve(), object_digests)
+                object_digests[obj.objid] = sub_digest.digest()
+            digest.update(object_digests[obj.objid] or b'<cycle>')
+        elif isinstance(obj, PDFStream):
+            digest.update(b'<stream>')
+            self._hash_pdf_object(digest, obj.attrs, object_digests)
+            digest.update(obj.get_data())
+        elif isinstance(obj, dict):
+            digest.update(b'<dict>')
+            for key in sorted(obj):
+                if key == 'Parent':  # Points back up the page tree
+                    continue
+                digest.update(str(key).encode('utf-8'))
+                self._hash_pdf_object(digest, obj[key], object_digests)
+        elif isinstance(obj, list):
+            digest.update(b'<list>')
+            for value in obj:
+                self._hash_pdf_object(digest, value, object_digests)
+        elif isinstance(obj, (PSLiteral, PSKeyword)):
+            digest.update(b'/' + str(obj.name).encode('utf-8'))
+        elif isinstance(obj, bytes):
+            digest.update(obj)
+        else:
+            digest.update(repr(obj).encode('utf-8'))
+        digest.update(b';')
+    
+    def _process_pages(self, pages_text, filename, page_hashes=None, file_hash=None):
         """Process all pages and group into orders"""
         orders = []
         current_order = None
@@ -103,6 +239,7 @@ class OrderParser:
         for page_idx, text in enumerate(pages_text):
             if not text:
                 continue
+            page_hash = page_hashes[page_idx] if page_hashes else None
                 
             # Check if this page starts a new order
             order_id_match = re.search(r'Order ID:\s*([0-9-]+)', text)
@@ -110,17 +247,20 @@ class OrderParser:
             if order_id_match:
                 # New order detected
                 if current_order:
-                    orders.extend(self._extract_items_from_order(current_order, filename))
+                    orders.extend(self._finish_order(current_order, filename, file_hash))
                 
                 current_order = {
                     'order_id': order_id_match.group(1),
                     'text': text,
-                    'page': page_idx + 1
+                    'page': page_idx + 1,
+                    'page_hashes': [page_hash]
                 }
             elif current_order:
                 # Continuation page - merge with current order
                 # Verify buyer name/address match (90% similarity would be implemented here)
                 current_order['text'] += '\n' + text
+                current_order['page_hashes'].append(page_hash)
+                current_order['last_page'] = page_idx + 1
             else:
                 # First page without Order ID - try to extract buyer info
                 buyer_match = re.search(r'^([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)', text, re.MULTILINE)
@@ -128,15 +268,56 @@ class OrderParser:
                     current_order = {
                         'order_id': f'UNKNOWN-{page_idx+1}',
                         'text': text,
-                        'page': page_idx + 1
+                        'page': page_idx + 1,
+                        'page_hashes': [page_hash]
                     }
         
         # Process last order
         if current_order:
-            orders.extend(self._extract_items_from_order(current_order, filename))
+            orders.extend(self._finish_order(current_order, filename, file_hash))
         
         return orders
     
+    def _finish_order(self, order_data, filename, file_hash):
+        """Extract items from a completed order and record where it came from"""
+        items = [
+            {**item, 'file_hash': file_hash}
+            for item in self._cached_items_from_order(order_data, filename)
+        ]
+        if items:
+            # Scoped to the file: synthetic UNKNOWN-n IDs repeat in every PDF
+            key = f"{file_hash}:{order_data['order_id']}"
+            self.order_locations[key] = {
+                'key': key,
+                'order_id': order_data['order_id'],
+                'buyer_name': items[0]['buyer_name'],
+                'source_file': filename,
+                'file_hash': file_hash,
+                'pages': [order_data['page'], order_data.get('last_page', order_data['page'])],
+                # Character offsets of each item's SKU line within the order text
+                'item_positions': [
+                    match.start() for match in re.finditer(self.SKU_PATTERN, order_data['text'])
+                ],
+                'items': items
+            }
+        return items
+    
+    def _cached_items_from_order(self, order_data, filename):
+        """Extract items from an order, reusing results for previously seen pages"""
+        page_hashes = order_data.get('page_hashes') or [None]
+        if None in page_hashes:
+            return self._extract_items_from_order(order_data, filename)
+        
+        # Keyed on every page of the order, so an order that picks up a new
+        # continuation page in a later export is parsed again in full
+        cache_key = (order_data['order_id'], *page_hashes)
+        items = self.page_cache.get_items(cache_key)
+        if items is None:
+            items = self._extract_items_from_order(order_data, filename)
+            self.page_cache.put_items(cache_key, items)
+        
+        return [{**item, 'source_file': filename} for item in items]
+    
     def _extract_items_from_order(self, order_data, filename):
         """Extract individual items from an order"""
         text = order_data['text']
@@ -151,9 +332,8 @@ class OrderParser:
         # Find all SKU blocks
         items = []
         
-        # Pattern to find SKU lines and their customization blocks
-        sku_pattern = r'(Set-\d+Pcs|HT-\d+Pcs|BT-\d+Pcs|BS-\d+Pcs)-([A-Za-z]+)'
-        matches = list(re.finditer(sku_pattern, text))
+        # Find SKU lines and their customization blocks
+        matches = list(re.finditer(self.SKU_PATTERN, text))
         
         for match in matches:
             sku = match.group(0)
@@ -553,13 +733,205 @@ class ProductionPlanner:
         return summary
 
 
+@st.cache_resource
+def get_order_index_lock():
+    """Lock shared by every session for the files under ORDER_INDEX_DIR"""
+    # Held via cache_resource because Streamlit re-executes this script on
+    # every rerun, which would give a plain module-level lock per run
+    return threading.RLock()
+
+
+def read_json(path):
+    """Load a JSON object from disk, treating a missing or unreadable file as empty"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def write_json_atomic(path, data, **dump_kwargs):
+    """Write JSON to a temp file and move it into place, so readers never see a partial file"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=path.parent,
+                                     suffix='.tmp', delete=False) as f:
+        try:
+            json.dump(data, f, **dump_kwargs)
+            f.flush()
+            os.fsync(f.fileno())
+        except Exception:
+            f.close()
+            os.unlink(f.name)
+            raise
+    os.replace(f.name, path)
+
+
+class OrderIndex:
+    """Persistent index from order ID to its source PDF, pages and parsed items"""
+    
+    # Days an order (and the PDF it came from) stays in the index
+    RETENTION_DAYS = 30
+    
+    def __init__(self, directory=ORDER_INDEX_DIR):
+        self.directory = Path(directory)
+        self.index_path = self.directory / 'index.json'
+        self.pdf_dir = self.directory / 'pdfs'
+        with get_order_index_lock():
+            self.orders = read_json(self.index_path)
+    
+    def add_parsed(self, parser, today=None):
+        """Merge the order locations and source PDFs from a parser run into the saved index"""
+        today = today or date.today()
+        with get_order_index_lock():
+            # Re-read so entries saved by other sessions since __init__ are kept
+            self.orders = read_json(self.index_path)
+            
+            self.pdf_dir.mkdir(parents=True, exist_ok=True)
+            for file_hash, pdf_bytes in parser.source_pdfs.items():
+                pdf_path = self.pdf_dir / f"{file_hash}.pdf"
+                if not pdf_path.exists():
+                    pdf_path.write_bytes(pdf_bytes)
+            for key, entry in parser.order_locations.items():
+                self.orders[key] = {**entry, 'parsed_on': today.isoformat()}
+            
+            cutoff = (today - timedelta(days=self.RETENTION_DAYS)).isoformat()
+            self.orders = {
+                key: entry for key, entry in self.orders.items()
+                if entry.get('parsed_on', '') >= cutoff
+            }
+            self._save()
+    
+    def _save(self):
+        """Write the index to disk and delete PDFs no entry refers to any more (lock held)"""
+        write_json_atomic(self.index_path, self.orders, indent=1)
+        
+        referenced = {entry['file_hash'] for entry in self.orders.values()}
+        if self.pdf_dir.exists():
+            for pdf_path in self.pdf_dir.glob('*.pdf'):
+                if pdf_path.stem not in referenced:
+                    pdf_path.unlink(missing_ok=True)
+    
+    def find(self, order_id):
+        """Entries for an exact order ID, most recently parsed first"""
+        entries = [entry for entry in self.orders.values() if entry['order_id'] == order_id]
+        return sorted(entries, key=lambda entry: entry.get('parsed_on', ''), reverse=True)
+    
+    def search(self, query):
+        """Find orders whose ID or buyer name contains the query (case-insensitive)"""
+        query = query.strip().lower()
+        if not query:
+            return []
+        return [
+            entry for entry in self.orders.values()
+            if query in entry['order_id'].lower() or query in entry['buyer_name'].lower()
+        ]
+    
+    def extract_slip_pages(self, entry):
+        """Copy the original packing slip pages of an order into a new PDF"""
+        pdf_path = self.pdf_dir / f"{entry['file_hash']}.pdf"
+        if not pdf_path.exists():
+            return None
+        
+        first_page, last_page = entry['pages']
+        source = pdfium.PdfDocument(str(pdf_path))
+        slip = pdfium.PdfDocument.new()
+        try:
+            slip.import_pages(source, pages=list(range(first_page - 1, last_page)))
+            buffer = BytesIO()
+            slip.save(buffer)
+        finally:
+            slip.close()
+            source.close()
+        
+        buffer.seek(0)
+        return buffer
+
+
+class OrderDeduplicator:
+    """Drops items already seen in this batch, earlier today or in recent prior days"""
+    
+    # How many days of item keys are kept on disk
+    HISTORY_DAYS = 30
+    
+    def __init__(self, history_path=ORDER_INDEX_DIR / 'seen_items.json'):
+        self.history_path = Path(history_path)
+        # ISO date -> {item key: hashes of the files it was parsed from that day}
+        with get_order_index_lock():
+            self.history = read_json(self.history_path)
+    
+    @staticmethod
+    def item_key(item):
+        """Hash of the normalized (order_id, sku, customization, quantity) record"""
+        fields = [
+            str(item['order_id']).strip(),
+            str(item['sku']).strip().lower(),
+            re.sub(r'\s+', ' ', str(item['customization_text'])).strip().lower(),
+            str(int(item['quantity']))
+        ]
+        return hashlib.sha1('\x1f'.join(fields).encode('utf-8')).hexdigest()
+    
+    def deduplicate(self, items, window_days=0, today=None):
+        """Split items into (kept, duplicates), checking today and the last window_days of history"""
+        today = today or date.today()
+        
+        # key -> first prior day it was seen; any match here is a duplicate
+        prior_seen = {}
+        for days_back in range(window_days, 0, -1):
+            day = (today - timedelta(days=days_back)).isoformat()
+            for key in self.history.get(day, {}):
+                prior_seen.setdefault(key, day)
+        # key -> hashes of the files it was parsed from earlier today
+        today_seen = self.history.get(today.isoformat(), {})
+        
+        # key -> source file of its first occurrence in this batch
+        batch_seen = {}
+        kept = []
+        duplicates = []
+        for item in items:
+            key = self.item_key(item)
+            if key in batch_seen:
+                duplicates.append({**item, 'duplicate_of': batch_seen[key]})
+                continue
+            batch_seen[key] = item['source_file']
+            
+            if key in prior_seen:
+                duplicates.append({**item, 'duplicate_of': prior_seen[key]})
+            # Re-parsing the very same file today is not a duplicate; the same
+            # item in a different file (e.g. a later superset export) is
+            elif key in today_seen and item['file_hash'] not in today_seen[key]:
+                duplicates.append({**item, 'duplicate_of': today.isoformat()})
+            else:
+                kept.append(item)
+        
+        return kept, duplicates
+    
+    def record(self, items, today=None):
+        """Add items to today's history, prune old days and write to disk"""
+        today = today or date.today()
+        day = today.isoformat()
+        with get_order_index_lock():
+            # Re-read so keys recorded by other sessions since __init__ are kept
+            self.history = read_json(self.history_path)
+            keys = self.history.setdefault(day, {})
+            for item in items:
+                file_hashes = keys.setdefault(self.item_key(item), [])
+                if item['file_hash'] not in file_hashes:
+                    file_hashes.append(item['file_hash'])
+            
+            cutoff = (today - timedelta(days=self.HISTORY_DAYS)).isoformat()
+            self.history = {d: k for d, k in self.history.items() if d >= cutoff}
+            write_json_atomic(self.history_path, self.history)
+
+
 def main():
     """Main Streamlit application"""
     st.title("🧺 Amazon Towel Order Parser")
     st.markdown("Parse Amazon packing slips, generate labels, and plan production")
     
     # Create tabs
-    tab1, tab2, tab3, tab4 = st.tabs(["📤 Upload", "📋 Orders", "🏭 Production", "🎁 Gift Labels"])
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["📤 Upload", "📋 Orders", "🏭 Production", "🎁 Gift Labels", "🔎 Reprint"])
     
     # TAB 1: Upload
     with tab1:
@@ -572,21 +944,51 @@ def main():
             accept_multiple_files=True
         )
         
+        window_days = st.number_input(
+            "Also drop orders already parsed in the previous N days",
+            min_value=0,
+            max_value=OrderDeduplicator.HISTORY_DAYS,
+            value=0,
+            help="Duplicates within the uploaded files and from earlier uploads today are always removed"
+        )
+        
         if uploaded_files:
             if st.button("Parse PDFs", type="primary"):
                 with st.spinner("Parsing PDFs..."):
-                    parser = OrderParser()
+                    parser = OrderParser(page_cache=get_page_cache())
                     all_orders = []
                     
                     for uploaded_file in uploaded_files:
                         orders = parser.parse_pdf(uploaded_file, uploaded_file.name)
                         all_orders.extend(orders)
                     
+                    order_index = OrderIndex()
+                    order_index.add_parsed(parser)
+                    
+                    deduplicator = OrderDeduplicator()
+                    all_orders, duplicates = deduplicator.deduplicate(all_orders, window_days)
+                    deduplicator.record(all_orders)
+                    st.session_state.duplicates = duplicates
+                    
                     if all_orders:
                         st.session_state.parsed_data = pd.DataFrame(all_orders)
                         st.success(f"✅ Successfully parsed {len(all_orders)} items from {len(uploaded_files)} file(s)")
+                    elif duplicates:
+                        st.session_state.parsed_data = None
+                        st.warning("All parsed items were duplicates")
                     else:
                         st.error("No orders found in uploaded PDFs")
+        
+        # Duplicate report, shown before any labels are generated
+        if st.session_state.duplicates:
+            st.warning(f"⚠️ Dropped {len(st.session_state.duplicates)} duplicate item(s)")
+            st.dataframe(
+                pd.DataFrame(st.session_state.duplicates)[[
+                    'order_id', 'buyer_name', 'sku', 'customization_text',
+                    'quantity', 'source_file', 'duplicate_of'
+                ]],
+                use_container_width=True
+            )
     
     # TAB 2: Orders
     with tab2:
@@ -741,7 +1143,121 @@ def main():
                 st.info("No orders with gift messages found")
         else:
             st.info("👆 Upload and parse PDFs in the Upload tab first")
+    
+    # TAB 5: Reprint
+    with tab5:
+        st.header("Reprint a Single Order")
+        st.markdown("Search previously parsed orders by Order ID or buyer name")
+        
+        query = st.text_input("Order ID or buyer name")
+        if query:
+            order_index = OrderIndex()
+            hits = order_index.search(query)
+            
+            if not hits:
+                st.info("No matching orders found")
+            
+            for entry in hits[:20]:  # Show first 20
+                first_page, last_page = entry['pages']
+                with st.expander(f"Order {entry['order_id']} - {entry['buyer_name']}"):
+                    st.write(f"**Source:** {entry['source_file']} (pages {first_page}-{last_page})")
+                    st.dataframe(
+                        pd.DataFrame(entry['items'])[[
+                            'sku', 'thread_color', 'customization_text', 'font', 'quantity'
+                        ]],
+                        use_container_width=True
+                    )
+                    
+                    label_gen = LabelGenerator()
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        st.download_button(
+                            label="🏷️ Manufacturing Labels",
+                            data=label_gen.generate_manufacturing_labels(entry['items']),
+                            file_name=f"labels_{entry['order_id']}.pdf",
+                            mime="application/pdf",
+                            key=f"reprint_labels_{entry['key']}"
+                        )
+                    with col2:
+                        gift_labels_pdf = label_gen.generate_gift_labels(entry['items'])
+                        if gift_labels_pdf:
+                            st.download_button(
+                                label="🎁 Gift Labels",
+                                data=gift_labels_pdf,
+                                file_name=f"gift_labels_{entry['order_id']}.pdf",
+                                mime="application/pdf",
+                                key=f"reprint_gift_{entry['key']}"
+                            )
+                    with col3:
+                        if st.button("📄 Original Slip Pages", key=f"reprint_slip_{entry['key']}"):
+                            slip_pdf = order_index.extract_slip_pages(entry)
+                            if slip_pdf:
+                                st.download_button(
+                                    label="📥 Download Slip Pages",
+                                    data=slip_pdf,
+                                    file_name=f"slip_{entry['order_id']}.pdf",
+                                    mime="application/pdf",
+                                    key=f"reprint_slip_download_{entry['key']}"
+                                )
+                            else:
+                                st.error("Original PDF is no longer available")
+            
+            if len(hits) > 20:
+                st.info(f"...and {len(hits) - 20} more")
+
+
+def cli(argv):
+    """Command-line order lookup and reprint (python app.py lookup|reprint ...)"""
+    arg_parser = argparse.ArgumentParser(prog="app.py")
+    subcommands = arg_parser.add_subparsers(dest="command", required=True)
+    
+    lookup = subcommands.add_parser("lookup", help="Search orders by Order ID or buyer name")
+    lookup.add_argument("query")
+    
+    reprint = subcommands.add_parser("reprint", help="Write labels and slip pages for one order")
+    reprint.add_argument("order_id")
+    reprint.add_argument("--file", help="Source filename or file hash, when the order is in several PDFs")
+    reprint.add_argument("--out", default=".", help="Output directory")
+    
+    args = arg_parser.parse_args(argv)
+    order_index = OrderIndex()
+    
+    if args.command == "lookup":
+        for entry in order_index.search(args.query):
+            first_page, last_page = entry['pages']
+            print(f"{entry['order_id']}\t{entry['buyer_name']}\t"
+                  f"{entry['source_file']} pages {first_page}-{last_page}\t"
+                  f"{len(entry['items'])} item(s)")
+        return 0
+    
+    entries = [
+        entry for entry in order_index.find(args.order_id)
+        if not args.file or args.file in (entry['source_file'], entry['file_hash'])
+    ]
+    if not entries:
+        print(f"Order {args.order_id} not found in index", file=sys.stderr)
+        return 1
+    if len(entries) > 1:
+        print(f"Order {args.order_id} is in {len(entries)} files, using the most recent "
+              f"({entries[0]['source_file']}); pass --file to choose", file=sys.stderr)
+    entry = entries[0]
+    
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    label_gen = LabelGenerator()
+    outputs = {
+        f"labels_{args.order_id}.pdf": label_gen.generate_manufacturing_labels(entry['items']),
+        f"gift_labels_{args.order_id}.pdf": label_gen.generate_gift_labels(entry['items']),
+        f"slip_{args.order_id}.pdf": order_index.extract_slip_pages(entry),
+    }
+    for name, buffer in outputs.items():
+        if buffer:
+            (out_dir / name).write_bytes(buffer.getvalue())
+            print(f"Wrote {out_dir / name}")
+    return 0
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(cli(sys.argv[1:]))
     main()
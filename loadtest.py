@@ -0,0 +1,85 @@
+"""
+Amazon Towel Order Parser - Service Load Test
+Submits many packing slips concurrently to service.py and reports throughput
+and latency (submit until the job is done).
+
+Run with:  python loadtest.py sample.pdf --jobs 200 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import math
+import time
+
+import aiohttp
+
+
+async def run_job(session, url, pdf_bytes, filename, poll_interval):
+    """Submit one PDF and poll until it finishes; returns (latency, status, rejections)"""
+    start = time.perf_counter()
+    rejections = 0
+
+    while True:
+        async with session.post(f"{url}/jobs", data=pdf_bytes, params={'filename': filename},
+                                headers={'Content-Type': 'application/pdf'}) as resp:
+            if resp.status == 503:
+                # Backpressure - wait as the server asks and resubmit
+                rejections += 1
+                await asyncio.sleep(float(resp.headers.get('Retry-After', 1)))
+                continue
+            resp.raise_for_status()
+            job = await resp.json()
+            break
+
+    while job['status'] in ('queued', 'running'):
+        await asyncio.sleep(poll_interval)
+        async with session.get(f"{url}/jobs/{job['job_id']}") as resp:
+            job = await resp.json()
+
+    return time.perf_counter() - start, job['status'], rejections
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    rank = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[rank]
+
+
+async def main(args):
+    with open(args.pdf, 'rb') as f:
+        pdf_bytes = f.read()
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def limited(session, i):
+        async with semaphore:
+            return await run_job(session, args.url, pdf_bytes, f"loadtest_{i}.pdf", args.poll_interval)
+
+    start = time.perf_counter()
+    async with aiohttp.ClientSession() as session:
+        results = await asyncio.gather(*(limited(session, i) for i in range(args.jobs)))
+    elapsed = time.perf_counter() - start
+
+    latencies = [latency for latency, status, _ in results if status == 'done']
+    failed = sum(1 for _, status, _ in results if status != 'done')
+    rejections = sum(r for _, _, r in results)
+
+    print(f"Jobs:        {args.jobs} ({failed} failed)")
+    print(f"Elapsed:     {elapsed:.2f} s")
+    print(f"Throughput:  {args.jobs / elapsed:.2f} jobs/s")
+    print(f"Rejections:  {rejections} (503 backpressure)")
+    if latencies:
+        print(f"Latency p50: {percentile(latencies, 50) * 1000:.0f} ms")
+        print(f"Latency p95: {percentile(latencies, 95) * 1000:.0f} ms")
+        print(f"Latency max: {max(latencies) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Load test the local parsing service")
+    arg_parser.add_argument("pdf", help="Packing slip PDF to submit")
+    arg_parser.add_argument("--url", default="http://127.0.0.1:8600")
+    arg_parser.add_argument("--jobs", type=int, default=100, help="Total submissions")
+    arg_parser.add_argument("--concurrency", type=int, default=20, help="Submissions in flight at once")
+    arg_parser.add_argument("--poll-interval", type=float, default=0.1, help="Seconds between status polls")
+    asyncio.run(main(arg_parser.parse_args()))
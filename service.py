@@ -0,0 +1,234 @@
+"""
+Amazon Towel Order Parser - Local HTTP Service
+Exposes OrderParser, ProductionPlanner and LabelGenerator over HTTP so other
+systems can submit packing slips without going through the Streamlit UI.
+
+Run with:  python service.py --port 8600 --workers 4
+
+Endpoints:
+    POST /jobs                           Submit PDFs (raw application/pdf body or multipart files)
+    GET  /jobs/{job_id}                  Job status
+    GET  /jobs/{job_id}/items            Parsed items
+    GET  /jobs/{job_id}/summary          Production planning summary
+    GET  /jobs/{job_id}/labels/manufacturing   Manufacturing labels PDF
+    GET  /jobs/{job_id}/labels/gift            Gift labels PDF
+"""
+
+import argparse
+import asyncio
+import json
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from aiohttp import web
+
+# Importing app outside `streamlit run` only logs warnings for its page setup
+from app import OrderParser, ProductionPlanner, LabelGenerator
+
+
+# ---- Worker functions (run in the process pool) ----
+
+def parse_files(files):
+    """Parse a list of (filename, pdf bytes) into order items, raising on unreadable PDFs"""
+    parser = OrderParser()
+    items = []
+    for filename, pdf_bytes in files:
+        try:
+            items.extend(parser.parse_pdf_bytes(pdf_bytes, filename))
+        except Exception as e:
+            # Re-raised as a plain ValueError so it pickles back from the pool
+            raise ValueError(f"Error parsing {filename}: {e}") from None
+    return items
+
+
+def summarize_items(items):
+    """Production planning summary for a list of items"""
+    return ProductionPlanner().generate_summary(items)
+
+
+def render_labels(kind, items):
+    """Render manufacturing or gift labels, returning PDF bytes (None if no gift labels)"""
+    label_gen = LabelGenerator()
+    if kind == 'manufacturing':
+        buffer = label_gen.generate_manufacturing_labels(items)
+    else:
+        buffer = label_gen.generate_gift_labels(items)
+    return buffer.getvalue() if buffer else None
+
+
+def _json_default(value):
+    """Serialize numpy scalars coming back from pandas"""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+json_response = partial(web.json_response, dumps=partial(json.dumps, default=_json_default))
+
+
+class ParsingService:
+    """Async job queue in front of a process pool for parsing and rendering"""
+
+    # Finished jobs kept in memory before the oldest are dropped
+    MAX_JOBS = 1000
+
+    def __init__(self, workers=4, max_queue=32):
+        self.workers = workers
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        # Submissions beyond max_queue are rejected with 503 instead of piling up
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.render_slots = asyncio.Semaphore(max_queue)
+        self.jobs = OrderedDict()
+        self.consumers = []
+
+    async def start(self, app):
+        """Start one queue consumer per pool worker"""
+        self.consumers = [asyncio.create_task(self._consume()) for _ in range(self.workers)]
+
+    async def stop(self, app):
+        """Cancel consumers and shut down the pool"""
+        for task in self.consumers:
+            task.cancel()
+        await asyncio.gather(*self.consumers, return_exceptions=True)
+        self.pool.shutdown(cancel_futures=True)
+
+    async def _consume(self):
+        """Pull queued jobs and parse them in the pool"""
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.queue.get()
+            job['status'] = 'running'
+            try:
+                job['items'] = await loop.run_in_executor(self.pool, parse_files, job.pop('files'))
+                job['status'] = 'done'
+            except Exception as e:
+                job['status'] = 'failed'
+                job['error'] = str(e)
+            finally:
+                self.queue.task_done()
+
+    def _forget_old_jobs(self):
+        """Drop the oldest finished jobs once MAX_JOBS is exceeded"""
+        for job_id in list(self.jobs):
+            if len(self.jobs) <= self.MAX_JOBS:
+                break
+            if self.jobs[job_id]['status'] in ('done', 'failed'):
+                del self.jobs[job_id]
+
+    def _get_job(self, request):
+        """Look up the job in the URL or raise 404"""
+        job = self.jobs.get(request.match_info['job_id'])
+        if job is None:
+            raise web.HTTPNotFound(text='Unknown job')
+        return job
+
+    def _get_finished_job(self, request):
+        """Look up a job whose parsing has completed or raise 409"""
+        job = self._get_job(request)
+        if job['status'] != 'done':
+            raise web.HTTPConflict(text=f"Job is {job['status']}")
+        return job
+
+    async def submit(self, request):
+        """POST /jobs - queue PDFs for parsing"""
+        files = []
+        if request.content_type.startswith('multipart/'):
+            reader = await request.multipart()
+            async for part in reader:
+                if part.filename:
+                    files.append((part.filename, await part.read()))
+        else:
+            filename = request.query.get('filename', 'upload.pdf')
+            files.append((filename, await request.read()))
+
+        if not files or not all(pdf_bytes for _, pdf_bytes in files):
+            raise web.HTTPBadRequest(text='No PDF data received')
+
+        job = {
+            'job_id': uuid.uuid4().hex,
+            'status': 'queued',
+            'files': files,
+            'filenames': [filename for filename, _ in files],
+            'items': None,
+            'error': None
+        }
+        try:
+            self.queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise web.HTTPServiceUnavailable(text='Queue full, retry later', headers={'Retry-After': '1'})
+
+        self.jobs[job['job_id']] = job
+        self._forget_old_jobs()
+        return json_response(self._job_status(job), status=202)
+
+    def _job_status(self, job):
+        """Public view of a job"""
+        return {
+            'job_id': job['job_id'],
+            'status': job['status'],
+            'files': job['filenames'],
+            'item_count': len(job['items']) if job['items'] is not None else None,
+            'error': job['error']
+        }
+
+    async def status(self, request):
+        """GET /jobs/{job_id}"""
+        return json_response(self._job_status(self._get_job(request)))
+
+    async def items(self, request):
+        """GET /jobs/{job_id}/items"""
+        return json_response(self._get_finished_job(request)['items'])
+
+    async def _run_in_pool(self, func, *args):
+        """Run rendering work in the pool, rejecting when all slots are busy"""
+        if self.render_slots.locked():
+            raise web.HTTPServiceUnavailable(text='Too many requests, retry later', headers={'Retry-After': '1'})
+        async with self.render_slots:
+            return await asyncio.get_running_loop().run_in_executor(self.pool, func, *args)
+
+    async def summary(self, request):
+        """GET /jobs/{job_id}/summary"""
+        job = self._get_finished_job(request)
+        return json_response(await self._run_in_pool(summarize_items, job['items']))
+
+    async def labels(self, request):
+        """GET /jobs/{job_id}/labels/{kind}"""
+        job = self._get_finished_job(request)
+        kind = request.match_info['kind']
+        pdf_bytes = await self._run_in_pool(render_labels, kind, job['items'])
+        if not pdf_bytes:
+            raise web.HTTPNotFound(text='No labels for this job')
+        return web.Response(
+            body=pdf_bytes,
+            content_type='application/pdf',
+            headers={'Content-Disposition': f'attachment; filename="{kind}_labels_{job["job_id"]}.pdf"'}
+        )
+
+
+def create_app(workers=4, max_queue=32, max_upload_mb=64):
+    """Build the aiohttp application"""
+    service = ParsingService(workers=workers, max_queue=max_queue)
+    app = web.Application(client_max_size=max_upload_mb * 1024 * 1024)
+    app.on_startup.append(service.start)
+    app.on_cleanup.append(service.stop)
+    app.add_routes([
+        web.post('/jobs', service.submit),
+        web.get('/jobs/{job_id}', service.status),
+        web.get('/jobs/{job_id}/items', service.items),
+        web.get('/jobs/{job_id}/summary', service.summary),
+        web.get('/jobs/{job_id}/labels/{kind:manufacturing|gift}', service.labels),
+    ])
+    return app
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Local HTTP parsing service")
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=8600)
+    arg_parser.add_argument("--workers", type=int, default=4, help="Parser processes")
+    arg_parser.add_argument("--max-queue", type=int, default=32, help="Queued jobs before rejecting with 503")
+    args = arg_parser.parse_args()
+
+    web.run_app(create_app(args.workers, args.max_queue), host=args.host, port=args.port)